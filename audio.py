@@ -0,0 +1,43 @@
+from yt_dlp.postprocessor.ffmpeg import FFmpegExtractAudioPP, resolve_mapping
+
+
+AUDIO_BITRATES = ("320", "256", "192", "128")
+
+# mode: (format selector, FFmpegExtractAudio preferredcodec, description)
+AUDIO_MODES = {
+    "mp3": ('bestaudio/best', 'mp3', "MP3 (re-encoded)"),
+    "auto": ('bestaudio/best', 'best', "Original stream, remuxed only"),
+    "m4a": ('bestaudio[ext=m4a]/bestaudio/best', 'm4a', "M4A, stream copy when AAC"),
+    "opus": ('bestaudio[acodec=opus]/bestaudio/best', 'opus', "Opus, stream copy when Opus"),
+    "mp3_if_needed": ('bestaudio[ext=m4a]/bestaudio[ext=mp3]/bestaudio/best', 'm4a>m4a/mp3>mp3/mp3',
+                      "M4A kept as-is, MP3 only if needed"),
+}
+
+# Realtime multiple a single core reaches encoding MP3; used until a batch measures its own
+MP3_ENCODE_SPEED = 40.0
+
+
+def audio_options(mode, bitrate="320"):
+    """Return the format and postprocessor options for an audio mode"""
+    format_selector, codec, _ = AUDIO_MODES.get(mode, AUDIO_MODES["mp3"])
+    return {
+        'format': format_selector,
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': codec,
+            'preferredquality': bitrate,
+        }],
+    }
+
+
+def will_reencode(ext, acodec, codec_mapping):
+    """Predict whether FFmpegExtractAudio transcodes a file or just copies the stream"""
+    target, _ = resolve_mapping(ext or '', codec_mapping)
+    if not target or (target == 'best' and ext in FFmpegExtractAudioPP.COMMON_AUDIO_EXTS):
+        return False
+    codec = (acodec or '').split('.')[0]
+    if codec == 'mp4a':
+        codec = 'aac'
+    if codec == 'aac' and target in ('m4a', 'best'):
+        return False
+    return target not in ('best', codec)
@@ -0,0 +1,137 @@
+import concurrent.futures
+
+import yt_dlp
+
+from sessions import SessionPool
+
+
+EXTRACTION_MODES = ("inline", "thread", "process")
+
+# Options that hold callables (hooks, loggers) and cannot cross a process boundary
+UNPICKLABLE_OPTS = ('progress_hooks', 'postprocessor_hooks', 'post_hooks', 'logger', 'match_filter')
+
+# Bulky info keys the download workers never look at
+SLIM_DROP_KEYS = ('automatic_captions', 'subtitles', 'thumbnails', 'heatmap', 'description')
+
+
+class ExtractionError(Exception):
+    """Picklable error raised when a worker fails to extract a URL"""
+
+
+def extraction_opts(ydl_opts, playlist_mode=False):
+    """Build the options used for the metadata-only pass"""
+    opts = {k: v for k, v in ydl_opts.items() if k not in UNPICKLABLE_OPTS}
+    if playlist_mode:
+        # Only titles and IDs are needed to plan a playlist; entries resolve at download time
+        opts['extract_flat'] = 'in_playlist'
+    return opts
+
+
+def slim_info(info):
+    """Reduce an info dict to a plain, picklable record"""
+    if info is None:
+        return None
+    is_playlist = info.get('_type') == 'playlist' or 'entries' in info
+    # Same cleaning --load-info-json relies on, so the record can be fed back to process_ie_result
+    info = yt_dlp.YoutubeDL.sanitize_info(info, remove_private_keys=not is_playlist)
+    for key in SLIM_DROP_KEYS:
+        info.pop(key, None)
+    return info
+
+
+def extract_info(url, sessions):
+    """Run extract_info(url, download=False) on a pooled session and return a slimmed record"""
+    try:
+        with sessions.session() as session:
+            return slim_info(session.ydl.extract_info(url, download=False))
+    except Exception as e:
+        # yt-dlp errors carry tracebacks that do not pickle
+        raise ExtractionError(str(e)) from None
+
+
+# Sessions owned by a process-pool worker, kept for the life of the worker process
+_worker_sessions = None
+
+
+def _init_worker(ydl_opts):
+    global _worker_sessions
+    _worker_sessions = SessionPool(ydl_opts)
+
+
+def _extract_in_worker(url):
+    return extract_info(url, _worker_sessions)
+
+
+class ExtractionPool:
+    """Extracts metadata for a batch of URLs ahead of the download loop
+
+    Only a small window of items is prefetched so format URLs do not expire and
+    records do not pile up in memory before their download starts.
+    """
+
+    def __init__(self, mode="thread", max_workers=2):
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {mode}")
+        self.mode = mode
+        self.max_workers = max(1, int(max_workers))
+        self.window = self.max_workers * 2
+        self.executor = None
+        self.sessions = None
+        self.futures = {}
+        self.next_index = 0
+
+    def start(self, urls, ydl_opts, cookiejar=None):
+        """Begin prefetching the first items; results are collected in order with get()"""
+        self.urls = list(urls)
+        self.next_index = 0
+        if self.mode == "process":
+            # Each worker process keeps its own sessions
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_worker, initargs=(ydl_opts,))
+        else:
+            # Threads and inline extraction share the caller's cookies
+            self.sessions = SessionPool(ydl_opts, cookiejar=cookiejar)
+            if self.mode == "thread":
+                self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        self._fill(0)
+
+    def _fill(self, index):
+        """Queue extraction up to `window` items past index"""
+        if not self.executor:
+            return
+        while self.next_index < len(self.urls) and self.next_index < index + self.window:
+            self.futures[self.next_index] = self._submit(self.next_index)
+            self.next_index += 1
+
+    def _submit(self, index):
+        if self.mode == "process":
+            return self.executor.submit(_extract_in_worker, self.urls[index])
+        return self.executor.submit(extract_info, self.urls[index], self.sessions)
+
+    def get(self, index):
+        """Return the record for urls[index], waiting for it if needed"""
+        if not self.executor:
+            return extract_info(self.urls[index], self.sessions)
+        self._fill(index + 1)
+        future = self.futures.pop(index, None) or self._submit(index)
+        return future.result()
+
+    def skip(self, index):
+        """Drop the record for an item that will not be downloaded, cancelling it if not started"""
+        future = self.futures.pop(index, None)
+        if future:
+            future.cancel()
+        self._fill(index + 1)
+
+    def shutdown(self):
+        """Cancel pending work and release the workers"""
+        for future in self.futures.values():
+            future.cancel()
+        if self.executor:
+            # Worker threads extract on self.sessions; let them finish before the sessions close
+            self.executor.shutdown(wait=self.sessions is not None)
+        if self.sessions:
+            self.sessions.close()
+        self.executor = None
+        self.sessions = None
+        self.futures = {}
@@ -2,6 +2,10 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from pathlib import Path
 
+from audio import AUDIO_BITRATES, AUDIO_MODES
+from extraction import EXTRACTION_MODES
+from store import LINK_MODES
+
 
 class DownloaderGUI:
     def __init__(self, root, callbacks):
@@ -11,6 +15,7 @@ class DownloaderGUI:
         self.root.minsize(700, 600)
         
         self.callbacks = callbacks
+        self.paused = False
         self.download_path = str(Path.home() / "Downloads")
         
         self.setup_styles()
@@ -65,7 +70,8 @@ class DownloaderGUI:
         
         self.format_var = tk.StringVar(value="mp4")
         ttk.Radiobutton(format_frame, text="📹 MP4 (Video)", variable=self.format_var, value="mp4").pack(side=tk.LEFT, padx=(0, 20))
-        ttk.Radiobutton(format_frame, text="🎵 MP3 (Audio)", variable=self.format_var, value="mp3").pack(side=tk.LEFT)
+        ttk.Radiobutton(format_frame, text="🎵 MP3 (Audio)", variable=self.format_var, value="mp3").pack(side=tk.LEFT, padx=(0, 20))
+        ttk.Radiobutton(format_frame, text="🎧 Audio (Fast)", variable=self.format_var, value="audio").pack(side=tk.LEFT)
         
         # Playlist mode checkbox
         ttk.Label(options_frame, text="Playlist:").grid(row=0, column=2, sticky=tk.W, padx=(30, 10))
@@ -97,6 +103,23 @@ class DownloaderGUI:
         self.quality_desc.pack(side=tk.LEFT)
         self.quality_combo.bind("<<ComboboxSelected>>", self.on_quality_change)
         
+        # Audio output mode (used by "Audio (Fast)") and encoding bitrate
+        ttk.Label(options_frame, text="Audio:").grid(row=1, column=2, sticky=tk.W, padx=(30, 10), pady=(10, 0))
+        audio_frame = ttk.Frame(options_frame)
+        audio_frame.grid(row=1, column=3, columnspan=2, sticky=tk.W, pady=(10, 0))
+        
+        self.audio_mode_var = tk.StringVar(value="auto")
+        audio_combo = ttk.Combobox(audio_frame, textvariable=self.audio_mode_var, width=13, state="readonly")
+        # Plain MP3 has its own format button
+        audio_combo['values'] = tuple(mode for mode in AUDIO_MODES if mode != "mp3")
+        audio_combo.pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.audio_bitrate_var = tk.StringVar(value="320")
+        bitrate_combo = ttk.Combobox(audio_frame, textvariable=self.audio_bitrate_var, width=5, state="readonly")
+        bitrate_combo['values'] = AUDIO_BITRATES
+        bitrate_combo.pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Label(audio_frame, text="kbps").pack(side=tk.LEFT)
+        
         # Download path
         ttk.Label(options_frame, text="Save to:").grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
         path_frame = ttk.Frame(options_frame)
@@ -108,6 +131,52 @@ class DownloaderGUI:
         path_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10))
         ttk.Button(path_frame, text="📁 Browse", command=self.browse_path, width=12).grid(row=0, column=1)
         
+        # Metadata extraction pool
+        ttk.Label(options_frame, text="Extraction:").grid(row=3, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        extraction_frame = ttk.Frame(options_frame)
+        extraction_frame.grid(row=3, column=1, sticky=tk.W, pady=(10, 0))
+        
+        self.extraction_mode_var = tk.StringVar(value="inline")
+        extraction_combo = ttk.Combobox(extraction_frame, textvariable=self.extraction_mode_var, width=10, state="readonly")
+        extraction_combo['values'] = EXTRACTION_MODES
+        extraction_combo.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(extraction_frame, text="Workers:").pack(side=tk.LEFT, padx=(0, 5))
+        self.extraction_workers_var = tk.StringVar(value="2")
+        ttk.Spinbox(extraction_frame, from_=1, to=16, width=4, textvariable=self.extraction_workers_var).pack(side=tk.LEFT)
+        
+        # Partial files handling on stop
+        ttk.Label(options_frame, text="On stop:").grid(row=3, column=2, sticky=tk.W, padx=(30, 10), pady=(10, 0))
+        self.keep_partial_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="💾 Keep .part files", variable=self.keep_partial_var).grid(row=3, column=3, columnspan=2, sticky=tk.W, pady=(10, 0))
+        
+        # Incremental sync and repeat interval
+        ttk.Label(options_frame, text="Sync:").grid(row=4, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        sync_frame = ttk.Frame(options_frame)
+        sync_frame.grid(row=4, column=1, columnspan=4, sticky=tk.W, pady=(10, 0))
+        
+        self.sync_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(sync_frame, text="🔄 New videos only", variable=self.sync_var).pack(side=tk.LEFT, padx=(0, 20))
+        ttk.Label(sync_frame, text="Repeat every").pack(side=tk.LEFT, padx=(0, 5))
+        self.sync_interval_var = tk.StringVar(value="0")
+        ttk.Spinbox(sync_frame, from_=0, to=10080, width=6, textvariable=self.sync_interval_var).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Label(sync_frame, text="min (0 = run once)", style="Info.TLabel").pack(side=tk.LEFT)
+        
+        # Content store for videos shared between playlists
+        ttk.Label(options_frame, text="Shared videos:").grid(row=5, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        store_frame = ttk.Frame(options_frame)
+        store_frame.grid(row=5, column=1, columnspan=4, sticky=tk.W, pady=(10, 0))
+        
+        self.link_mode_var = tk.StringVar(value="off")
+        link_combo = ttk.Combobox(store_frame, textvariable=self.link_mode_var, width=10, state="readonly")
+        link_combo['values'] = ("off", *LINK_MODES)
+        link_combo.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(store_frame, text="(playlist mode: download once, link into every playlist folder)", style="Info.TLabel").pack(side=tk.LEFT)
+        
+        # Post-download verification
+        ttk.Label(options_frame, text="Verify:").grid(row=6, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        self.verify_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="🔍 Check files with ffprobe and repair broken ones", variable=self.verify_var).grid(row=6, column=1, columnspan=4, sticky=tk.W, pady=(10, 0))
+        
         # Control buttons
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=3, column=0, pady=15)
@@ -118,8 +187,14 @@ class DownloaderGUI:
         self.stop_btn = ttk.Button(button_frame, text="⏹ Stop", command=self.on_stop_download, state=tk.DISABLED, width=12)
         self.stop_btn.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.pause_btn = ttk.Button(button_frame, text="⏸ Pause", command=self.on_pause_toggle, state=tk.DISABLED, width=12)
+        self.pause_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
         self.clear_btn = ttk.Button(button_frame, text="🗑 Clear", command=self.clear_urls, width=12)
-        self.clear_btn.pack(side=tk.LEFT)
+        self.clear_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.verify_btn = ttk.Button(button_frame, text="🔍 Verify Folder", command=self.on_verify_folder, width=16)
+        self.verify_btn.pack(side=tk.LEFT)
         
         # Progress Section
         progress_frame = ttk.LabelFrame(main_frame, text=" Download Progress ", padding="10")
@@ -246,13 +321,49 @@ class DownloaderGUI:
                 self.quality_var.get(),
                 self.path_var.get(),
                 self.playlist_var.get(),
-                playlist_limit
+                playlist_limit,
+                extraction_mode=self.extraction_mode_var.get(),
+                extraction_workers=self.get_extraction_workers(),
+                audio_mode=self.audio_mode_var.get(),
+                audio_bitrate=self.audio_bitrate_var.get(),
+                keep_partial_files=self.keep_partial_var.get(),
+                sync_mode=self.sync_var.get(),
+                sync_interval=self.get_sync_interval(),
+                link_mode=self.link_mode_var.get(),
+                verify_downloads=self.verify_var.get()
             )
     
     def on_stop_download(self):
         if self.callbacks.get('stop_download'):
             self.callbacks['stop_download']()
     
+    def get_extraction_workers(self):
+        try:
+            return max(1, int(self.extraction_workers_var.get()))
+        except ValueError:
+            return 2
+    
+    def get_sync_interval(self):
+        try:
+            return max(0, int(self.sync_interval_var.get()))
+        except ValueError:
+            return 0
+    
+    def sync_schedule_enabled(self):
+        """Whether a scheduled sync should still run"""
+        return self.sync_var.get() and self.get_sync_interval() > 0
+    
+    def on_verify_folder(self):
+        self.log_text.delete(1.0, tk.END)
+        self.reset_progress()
+        if self.callbacks.get('verify_folder'):
+            self.callbacks['verify_folder'](self.path_var.get())
+    
+    def on_pause_toggle(self):
+        callback = 'resume_download' if self.paused else 'pause_download'
+        if self.callbacks.get(callback):
+            self.callbacks[callback]()
+    
     def log_message(self, message):
         """Add message to log with optional coloring"""
         self.log_text.insert(tk.END, f"{message}\n")
@@ -286,7 +397,8 @@ class DownloaderGUI:
             "fetching": "🔍",
             "downloading": "⬇️",
             "processing": "⚙️",
-            "complete": "✅"
+            "complete": "✅",
+            "error": "❌"
         }
         icon = phase_icons.get(phase, "📥")
         
@@ -313,15 +425,28 @@ class DownloaderGUI:
     def set_status(self, text):
         self.status_var.set(text)
     
-    def set_downloading_state(self, is_downloading):
+    def set_downloading_state(self, is_downloading, can_pause=True):
         if is_downloading:
             self.download_btn.config(state=tk.DISABLED)
             self.stop_btn.config(state=tk.NORMAL)
+            self.pause_btn.config(state=tk.NORMAL if can_pause else tk.DISABLED)
             self.clear_btn.config(state=tk.DISABLED)
+            self.verify_btn.config(state=tk.DISABLED)
         else:
             self.download_btn.config(state=tk.NORMAL)
             self.stop_btn.config(state=tk.DISABLED)
+            self.pause_btn.config(state=tk.DISABLED)
             self.clear_btn.config(state=tk.NORMAL)
+            self.verify_btn.config(state=tk.NORMAL)
+            self.set_paused_state(False)
+    
+    def set_paused_state(self, paused):
+        self.paused = paused
+        if paused:
+            self.pause_btn.config(text="▶ Resume")
+            self.status_var.set("⏸ Paused")
+        else:
+            self.pause_btn.config(text="⏸ Pause")
     
     def show_ffmpeg_download_dialog(self):
         """Show FFmpeg download confirmation dialog"""
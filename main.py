@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import messagebox
-import yt_dlp
 import threading
 import os
 import re
@@ -9,20 +8,42 @@ import urllib.request
 import shutil
 import time
 import sys
+import glob
+
+from yt_dlp.utils import DownloadCancelled, sanitize_filename
 
 from gui import DownloaderGUI
+from extraction import ExtractionPool, extraction_opts
+from sessions import SessionPool
+from sync import SYNC_RETRY_MS, SYNC_STATE_FILE, SyncState, channel_videos_url, fetch_new_entries
+from store import ContentStore, link_file
+from verify import VerificationPool, expected_streams, find_ffprobe, find_media_files, verify_file
+from audio import AUDIO_MODES, MP3_ENCODE_SPEED, audio_options, will_reencode
+from progress import FRAME_INTERVAL_MS, ProgressContext, format_bytes, format_time
 
 
 class YouTubeBulkDownloader:
     def __init__(self, root):
         self.root = root
         self.is_downloading = False
-        self.current_file_index = 0
-        self.total_files = 0
-        self.current_title = ""
+        self.cancel_event = threading.Event()
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+        self.partial_files = set()
+        self.keep_partial_files = True
+        self.sync_job = None
+        self.item_files = []
+        self.file_meta = {}
+        self.store_links = {}
+        self.verification = None
+        self.audio_only = False
+        self.progress = ProgressContext()
+        self.drawn_frame = None
+        self.progress_timer = None
         self.download_start_time = None
         self.file_start_time = None
         self.total_downloaded_bytes = 0
+        self.audio_stats = {}
         self.app_dir = os.path.dirname(os.path.abspath(__file__))
         self.ffmpeg_path = os.path.join(self.app_dir, "ffmpeg")
         
@@ -30,6 +51,9 @@ class YouTubeBulkDownloader:
         callbacks = {
             'start_download': self.start_download,
             'stop_download': self.stop_download,
+            'pause_download': self.pause_download,
+            'resume_download': self.resume_download,
+            'verify_folder': self.verify_folder,
         }
         self.gui = DownloaderGUI(root, callbacks)
         
@@ -118,22 +142,30 @@ class YouTubeBulkDownloader:
         self.gui.close_ffmpeg_progress_window()
         self.gui.show_ffmpeg_error(error, self.ffmpeg_path)
     
-    def validate_urls(self, urls, playlist_mode=False):
+    def validate_urls(self, urls, playlist_mode=False, sync_mode=False):
         valid_urls = []
         youtube_pattern = re.compile(r'(https?://)?(www\.)?(youtube\.com/watch\?v=|youtu\.be/|youtube\.com/playlist\?list=)')
         
         for url in urls:
             url = url.strip()
+            channel_url = channel_videos_url(url)
             if url and youtube_pattern.search(url):
                 valid_urls.append(url)
+            elif channel_url and (playlist_mode or sync_mode):
+                valid_urls.append(channel_url)
+            elif channel_url:
+                self.gui.log_message(f"Channel URL skipped (enable Playlist mode or Sync): {url}")
             elif url:
                 self.gui.log_message(f"Invalid URL skipped: {url}")
                 
         return valid_urls
     
-    def start_download(self, urls_input, format_type, quality, download_path, playlist_mode=False, playlist_limit=10):
+    def start_download(self, urls_input, format_type, quality, download_path, playlist_mode=False, playlist_limit=10,
+                       extraction_mode="inline", extraction_workers=2, audio_mode="auto", audio_bitrate="320",
+                       keep_partial_files=True, sync_mode=False, sync_interval=0, link_mode="off",
+                       verify_downloads=True):
         urls = urls_input.split('\n')
-        valid_urls = self.validate_urls(urls, playlist_mode)
+        valid_urls = self.validate_urls(urls, playlist_mode, sync_mode)
         
         if not valid_urls:
             messagebox.showwarning("No Valid URLs", "No valid YouTube URLs found.")
@@ -147,121 +179,161 @@ class YouTubeBulkDownloader:
                 return
         
         self.is_downloading = True
+        self.cancel_event.clear()
+        self.resume_event.set()
+        self.partial_files = set()
+        self.keep_partial_files = keep_partial_files
         self.download_start_time = time.time()
         self.total_downloaded_bytes = 0
+        self.progress = ProgressContext()
         self.gui.set_downloading_state(True)
+        if self.progress_timer:
+            self.root.after_cancel(self.progress_timer)
+        self.draw_progress()
         
         self.download_thread = threading.Thread(
             target=self.download_videos, 
-            args=(valid_urls, format_type, quality, download_path, playlist_mode, playlist_limit)
+            args=(valid_urls, format_type, quality, download_path, playlist_mode, playlist_limit,
+                  extraction_mode, extraction_workers, audio_mode, audio_bitrate, sync_mode, sync_interval,
+                  link_mode, verify_downloads)
         )
         self.download_thread.start()
     
     def stop_download(self):
         self.is_downloading = False
+        self.cancel_event.set()
+        self.resume_event.set()  # Wake paused transfers so they see the cancellation
         self.root.after(0, lambda: self.gui.set_progress_text("⏹ Stopping download..."))
         self.root.after(0, lambda: self.gui.set_status("Cancelling..."))
     
+    def pause_download(self):
+        if self.cancel_event.is_set():
+            return
+        self.resume_event.clear()
+        self.root.after(0, lambda: self.gui.set_paused_state(True))
+        self.gui.log_message("⏸ Paused")
+    
+    def resume_download(self):
+        self.resume_event.set()
+        self.root.after(0, lambda: self.gui.set_paused_state(False))
+        self.gui.log_message("▶ Resumed")
+    
+    def checkpoint(self):
+        """Hold the calling transfer while paused and abort it once Stop is pressed"""
+        if not self.resume_event.is_set():
+            self.resume_event.wait()
+        if self.cancel_event.is_set():
+            raise DownloadCancelled("Download cancelled by user")
+    
+    def remove_partial_files(self):
+        """Delete .part, fragment and .ytdl files left by interrupted transfers"""
+        removed = 0
+        for tmpfilename, filename in self.partial_files:
+            candidates = [tmpfilename, f"{filename}.ytdl", *glob.glob(glob.escape(tmpfilename) + "-Frag*")]
+            for path in candidates:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        self.partial_files = set()
+        return removed
+    
     def format_bytes(self, bytes_value):
         """Format bytes to human readable string"""
-        if bytes_value is None:
-            return "N/A"
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_value < 1024:
-                return f"{bytes_value:.2f} {unit}"
-            bytes_value /= 1024
-        return f"{bytes_value:.2f} TB"
+        return format_bytes(bytes_value)
     
     def format_time(self, seconds):
         """Format seconds to human readable string"""
-        if seconds is None or seconds < 0:
-            return "N/A"
-        if seconds < 60:
-            return f"{int(seconds)}s"
-        elif seconds < 3600:
-            mins, secs = divmod(int(seconds), 60)
-            return f"{mins}m {secs}s"
-        else:
-            hours, remainder = divmod(int(seconds), 3600)
-            mins, secs = divmod(remainder, 60)
-            return f"{hours}h {mins}m {secs}s"
+        return format_time(seconds)
     
-    def progress_hook(self, d):
-        """Handle download progress updates from yt-dlp"""
-        if d['status'] == 'downloading':
-            # Get raw values
-            downloaded = d.get('downloaded_bytes', 0)
-            total = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
-            speed = d.get('speed', 0)
-            eta = d.get('eta')
-            
-            # Calculate file percentage
-            if total > 0:
-                file_percent = (downloaded / total) * 100
-            else:
-                file_percent = 0
-            
-            # Calculate overall progress
-            if self.total_files > 0:
-                overall_percent = ((self.current_file_index + (file_percent / 100)) / self.total_files) * 100
-            else:
-                overall_percent = file_percent
-            
-            # Format values
-            downloaded_str = self.format_bytes(downloaded)
-            total_str = self.format_bytes(total) if total > 0 else "Unknown"
-            speed_str = f"{self.format_bytes(speed)}/s" if speed else "Calculating..."
-            eta_str = self.format_time(eta) if eta else "Calculating..."
-            
-            # Truncate title for display
-            display_title = self.current_title[:40] + "..." if len(self.current_title) > 40 else self.current_title
-            
-            # Update GUI
-            self.root.after(0, lambda: self.gui.update_progress(
-                overall_percent=overall_percent,
-                file_percent=file_percent,
-                file_num=self.current_file_index + 1,
-                total_files=self.total_files,
-                downloaded=downloaded_str,
-                total_size=total_str,
-                speed=speed_str,
-                eta=eta_str,
-                title=display_title,
-                phase="downloading"
-            ))
-            
+    def begin_progress(self, index, total_files, title):
+        """Bind a fresh progress context for the next item; its hook goes straight to yt-dlp"""
+        self.collect_progress()
+        self.progress = ProgressContext(index, total_files, title, self.checkpoint, self.partial_files)
+        return self.progress
+    
+    def collect_progress(self):
+        """Add the bytes finished under the current context to the batch total"""
+        self.total_downloaded_bytes += self.progress.finished_bytes
+        self.progress.finished_bytes = 0
+    
+    def draw_progress(self):
+        """Redraw the current item's progress once per frame, skipping frames with nothing new"""
+        self.progress_timer = None
+        if not self.is_downloading:
+            return
+        progress = self.progress
+        frame = (progress, progress.version)
+        if frame != self.drawn_frame:
+            self.drawn_frame = frame
+            self.gui.update_progress(**progress.fields())
+        self.progress_timer = self.root.after(FRAME_INTERVAL_MS, self.draw_progress)
+    
+    def postprocessor_hook(self, d):
+        """Time audio extraction to report encoding cost and CPU saved by stream copies"""
+        # Stop and Pause also apply between post-processing steps
+        if d['status'] == 'started':
+            self.checkpoint()
+        
+        info = d.get('info_dict') or {}
+        if d['status'] == 'finished' and d.get('postprocessor') == 'MoveFiles':
+            # Final location is known here; keep what verification and repair need
+            self.file_meta[info.get('filepath')] = (info.get('duration'), info.get('webpage_url'),
+                                                    expected_streams(info, self.audio_only))
+        
+        if d.get('postprocessor') != 'ExtractAudio':
+            return
+        
+        if d['status'] == 'started':
+            self.audio_pp_start = time.time()
+            self.audio_pp_reencode = will_reencode(info.get('ext'), info.get('acodec'), self.audio_codec_mapping)
+            if self.audio_pp_reencode:
+                self.root.after(0, lambda: self.gui.set_status("⚙️ Converting audio..."))
+        
         elif d['status'] == 'finished':
-            filename = d.get('filename', '')
-            filesize = d.get('total_bytes') or d.get('downloaded_bytes', 0)
-            self.total_downloaded_bytes += filesize
-            
-            self.root.after(0, lambda: self.gui.update_progress(
-                overall_percent=((self.current_file_index + 1) / self.total_files) * 100 if self.total_files > 0 else 100,
-                file_percent=100,
-                file_num=self.current_file_index + 1,
-                total_files=self.total_files,
-                downloaded=self.format_bytes(filesize),
-                total_size=self.format_bytes(filesize),
-                speed="--",
-                eta="--",
-                title=self.current_title[:40] + "..." if len(self.current_title) > 40 else self.current_title,
-                phase="processing"
-            ))
-        
-        elif d['status'] == 'error':
-            self.root.after(0, lambda: self.gui.set_status("❌ Error occurred"))
+            duration = info.get('duration') or 0
+            if self.audio_pp_reencode:
+                self.audio_stats['encoded'] += 1
+                self.audio_stats['encoded_seconds'] += duration
+                self.audio_stats['encode_time'] += time.time() - self.audio_pp_start
+            else:
+                self.audio_stats['copied'] += 1
+                self.audio_stats['copied_seconds'] += duration
+    
+    def post_hook(self, filepath):
+        """Record the final path of each file once all post-processing is done"""
+        self.progress.item_done()
+        self.item_files.append(filepath)
+        duration, url, streams = self.file_meta.pop(filepath, (None, None, ()))
+        if self.verification:
+            self.verification.submit({'path': filepath, 'duration': duration, 'url': url, 'streams': streams})
     
-    def download_videos(self, urls, format_type, quality, download_path, playlist_mode=False, playlist_limit=10):
+    def estimated_cpu_saved(self):
+        """Estimate encoding time avoided by stream-copied audio, calibrated on this batch's encodes"""
+        stats = self.audio_stats
+        speed = MP3_ENCODE_SPEED
+        if stats['encoded_seconds'] and stats['encode_time']:
+            speed = stats['encoded_seconds'] / stats['encode_time']
+        return stats['copied_seconds'] / speed
+    
+    def download_videos(self, urls, format_type, quality, download_path, playlist_mode=False, playlist_limit=10,
+                        extraction_mode="inline", extraction_workers=2, audio_mode="auto", audio_bitrate="320",
+                        sync_mode=False, sync_interval=0, link_mode="off", verify_downloads=True):
         total_urls = len(urls)
-        self.total_files = total_urls
         
         self.gui.log_message(f"{'='*50}")
         self.gui.log_message(f"📥 Starting bulk download")
         self.gui.log_message(f"   Format: {format_type.upper()}, Quality: {quality}")
         self.gui.log_message(f"   Playlist mode: {'Enabled' if playlist_mode else 'Disabled'}")
+        if sync_mode:
+            self.gui.log_message(f"   Sync mode: new entries only" +
+                                 (f", every {sync_interval} min" if sync_interval else ""))
         if playlist_mode:
             self.gui.log_message(f"   Playlist limit: {playlist_limit} videos")
         self.gui.log_message(f"   Total URLs: {total_urls}")
+        if extraction_mode != "inline":
+            self.gui.log_message(f"   Extraction: {extraction_mode} pool ({extraction_workers} workers)")
         self.gui.log_message(f"{'='*50}")
         
         ffmpeg_location = None
@@ -281,7 +353,8 @@ class YouTubeBulkDownloader:
             'quiet': True,
             'no_warnings': True,
             'verbose': False,
-            'progress_hooks': [self.progress_hook],
+            'postprocessor_hooks': [self.postprocessor_hook],
+            'post_hooks': [self.post_hook],
         }
         
         # Add playlist-specific options
@@ -293,18 +366,20 @@ class YouTubeBulkDownloader:
         if ffmpeg_location:
             common_opts['ffmpeg_location'] = ffmpeg_location
         
-        if format_type == "mp3":
+        self.audio_stats = {'copied': 0, 'encoded': 0, 'copied_seconds': 0, 'encoded_seconds': 0, 'encode_time': 0}
+        
+        if format_type in ("mp3", "audio"):
             if not ffmpeg_location:
-                self.gui.log_message("⚠ WARNING: FFmpeg not found. MP3 conversion may fail.")
+                self.gui.log_message("⚠ WARNING: FFmpeg not found. Audio extraction may fail.")
+            
+            if format_type == "mp3":
+                audio_mode = "mp3"
+            self.audio_codec_mapping = AUDIO_MODES.get(audio_mode, AUDIO_MODES["mp3"])[1]
+            self.gui.log_message(f"🎵 Audio: {AUDIO_MODES.get(audio_mode, AUDIO_MODES['mp3'])[2]}, {audio_bitrate} kbps when encoding")
             
             ydl_opts = {
                 **common_opts,
-                'format': 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '320',
-                }],
+                **audio_options(audio_mode, audio_bitrate),
             }
         else:
             if ffmpeg_location:
@@ -330,35 +405,85 @@ class YouTubeBulkDownloader:
         successful_downloads = 0
         failed_downloads = []
         
+        # One long-lived YoutubeDL per worker keeps connections, cookies and player caches warm
+        session_pool = SessionPool(ydl_opts)
+        
+        # Finished files are checked with ffprobe in the background while the next ones download
+        self.verification = None
+        self.store_links = {}
+        self.audio_only = format_type != "mp4"
+        ffprobe = find_ffprobe(self.ffmpeg_path) if verify_downloads else None
+        if ffprobe:
+            self.verification = VerificationPool(ffprobe)
+        elif verify_downloads:
+            self.gui.log_message("⚠ ffprobe not found - downloads will not be verified")
+        
+        # Videos shared between playlists are fetched once into a content store and linked into each folder
+        content_store = None
+        if playlist_mode and link_mode != "off":
+            content_store = ContentStore(download_path, link_mode)
+            variant = f"{format_type}-{quality}" if format_type == "mp4" else f"{audio_mode}-{audio_bitrate}"
+            self.gui.log_message(f"♻ Content store: {content_store.root} ({link_mode})")
+        
+        # Sync and the content store work per video, so playlists are expanded into their entries,
+        # each saved into its playlist folder
+        item_outtmpls = [None] * len(urls)
+        item_entries = [None] * len(urls)
+        sync_state = None
+        if sync_mode or content_store:
+            if sync_mode:
+                sync_state = SyncState(os.path.join(download_path, SYNC_STATE_FILE))
+            urls, item_outtmpls, item_entries = self.plan_entries(
+                urls, session_pool, sync_state, download_path, playlist_limit)
+            playlist_mode = False
+            total_urls = len(urls)
+            self.gui.log_message(f"🔄 {total_urls} video(s) queued")
+        
+        # Extract metadata ahead of the download loop so parsing overlaps with transfers
+        extraction_pool = None
+        if extraction_mode != "inline":
+            extraction_pool = ExtractionPool(extraction_mode, extraction_workers)
+            extraction_pool.start(urls, extraction_opts(ydl_opts, playlist_mode), cookiejar=session_pool.cookiejar)
+        
         for i, url in enumerate(urls):
+            if not self.resume_event.is_set():
+                self.resume_event.wait()
             if not self.is_downloading:
                 self.gui.log_message(f"\n⏹ Download cancelled by user")
                 break
             
-            self.current_file_index = i
             self.file_start_time = time.time()
+            progress = self.begin_progress(
+                i, total_urls, "Fetching video info..." if not playlist_mode else "Fetching playlist info...")
             
             try:
-                # Fetch video info first
-                self.root.after(0, lambda idx=i: self.gui.update_progress(
-                    overall_percent=(idx / total_urls) * 100,
-                    file_percent=0,
-                    file_num=idx + 1,
-                    total_files=total_urls,
-                    downloaded="--",
-                    total_size="--",
-                    speed="--",
-                    eta="--",
-                    title="Fetching video info..." if not playlist_mode else "Fetching playlist info...",
-                    phase="fetching"
-                ))
-                
                 self.gui.log_message(f"\n{'─'*40}")
                 self.gui.log_message(f"📄 [{i+1}/{total_urls}] Processing...")
                 
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                entry = item_entries[i]
+                outtmpl = item_outtmpls[i]
+                store_key = None
+                if content_store and entry:
+                    store_key = content_store.make_key(entry['id'], variant)
+                    if content_store.lookup(store_key):
+                        if extraction_pool:
+                            extraction_pool.skip(i)
+                        self.link_from_store(content_store, session_pool, store_key, entry, outtmpl, reused=True)
+                        if sync_state:
+                            sync_state.mark_known(entry['source'], entry['id'], entry['playlist'])
+                            sync_state.save()
+                        successful_downloads += 1
+                        continue
+                    outtmpl = content_store.outtmpl(store_key)
+                
+                self.item_files = []
+                with session_pool.session(outtmpl=outtmpl, progress_hooks=[progress.hook]) as session:
+                    ydl = session.ydl
                     # Get info first
-                    info = ydl.extract_info(url, download=False)
+                    if extraction_pool:
+                        info = extraction_pool.get(i)
+                    else:
+                        info = ydl.extract_info(url, download=False)
                     
                     # Handle playlist info
                     if playlist_mode and info and 'entries' in info:
@@ -366,33 +491,26 @@ class YouTubeBulkDownloader:
                         playlist_count = min(len([e for e in info['entries'] if e]), playlist_limit)
                         self.gui.log_message(f"   📋 Playlist: {playlist_title}")
                         self.gui.log_message(f"   📁 Videos to download: {playlist_count}")
-                        self.current_title = f"Playlist: {playlist_title}"
-                        self.total_files = playlist_count
-                        self.current_file_index = 0
+                        progress.start_playlist(playlist_title, playlist_count)
                     else:
-                        self.current_title = info.get('title', 'Unknown') if info else 'Unknown'
+                        title = info.get('title', 'Unknown') if info else 'Unknown'
                         duration = info.get('duration', 0) if info else 0
+                        progress.set_title(title)
                         
-                        self.gui.log_message(f"   Title: {self.current_title}")
+                        self.gui.log_message(f"   Title: {title}")
                         if duration:
                             self.gui.log_message(f"   Duration: {self.format_time(duration)}")
                     
-                    # Create a custom progress hook for playlists
+                    # Playlist entries move the context's index along as each one starts
                     if playlist_mode:
-                        self.playlist_video_index = 0
-                        original_hook = self.progress_hook
-                        
-                        def playlist_progress_hook(d):
-                            if d['status'] == 'finished':
-                                self.playlist_video_index += 1
-                                self.current_file_index = self.playlist_video_index
-                            original_hook(d)
-                        
-                        ydl_opts['progress_hooks'] = [playlist_progress_hook]
-                        with yt_dlp.YoutubeDL(ydl_opts) as ydl_playlist:
-                            ydl_playlist.download([url])
+                        session.download([url])
+                    elif extraction_pool and info:
+                        # Reuse the prefetched record instead of extracting again; this path has no
+                        # return code, so an item that produced no file counts as failed
+                        ydl.process_ie_result(info, download=True)
+                        session.failed = not self.item_files
                     else:
-                        ydl.download([url])
+                        session.download([url])
                     
                     if info and not playlist_mode:
                         height = info.get('height', 'N/A')
@@ -400,15 +518,65 @@ class YouTubeBulkDownloader:
                         if height != 'N/A' and width != 'N/A':
                             self.gui.log_message(f"   Resolution: {width}x{height}")
                 
+                if entry and not self.item_files:
+                    # ignoreerrors turned the failure into a log line; nothing reached the folder
+                    failed_downloads.append((url, "download failed, no file produced"))
+                    self.gui.log_message(f"   ✗ Failed: download failed, no file produced")
+                    continue
+                
+                if store_key and self.item_files:
+                    content_store.add(store_key, self.item_files[-1], time.time() - self.file_start_time,
+                                      entry['title'])
+                    self.link_from_store(content_store, session_pool, store_key, entry, item_outtmpls[i], reused=False)
+                
+                # With ignoreerrors a failed entry returns without raising; only remember it once a file exists
+                if sync_state and entry and self.item_files:
+                    sync_state.mark_known(entry['source'], entry['id'], entry['playlist'])
+                    sync_state.save()
+                
                 file_time = time.time() - self.file_start_time
                 successful_downloads += 1
                 self.gui.log_message(f"   ✓ Completed in {self.format_time(file_time)}")
                 
+            except DownloadCancelled:
+                self.gui.log_message(f"\n⏹ Download cancelled by user")
+                break
+                
             except Exception as e:
                 error_msg = str(e)[:100]
                 failed_downloads.append((url, error_msg))
                 self.gui.log_message(f"   ✗ Failed: {error_msg}")
         
+        if extraction_pool:
+            extraction_pool.shutdown()
+        
+        verified_files = broken_files = repaired_files = 0
+        if self.verification:
+            verification, self.verification = self.verification, None
+            if self.cancel_event.is_set():
+                verification.shutdown()
+            else:
+                verified_files = len(verification.futures)
+                self.root.after(0, lambda: self.gui.set_status("🔍 Verifying downloads..."))
+                broken = verification.results()
+                verification.shutdown()
+                broken_files = len(broken)
+                if broken:
+                    still_broken = self.repair_files(broken, session_pool, ffprobe)
+                    repaired_files = broken_files - len(still_broken)
+                    # Files that could not be repaired no longer count as completed
+                    for job, problem in still_broken:
+                        failed_downloads.append((job.get('url') or job['path'], problem))
+                    successful_downloads = max(0, successful_downloads - len(still_broken))
+        session_pool.close()
+        self.collect_progress()
+        
+        if self.cancel_event.is_set() and self.partial_files:
+            if self.keep_partial_files:
+                self.gui.log_message(f"💾 Kept {len(self.partial_files)} partial file(s) for resuming later")
+            else:
+                self.gui.log_message(f"🗑 Removed {self.remove_partial_files()} partial file(s)")
+        
         # Final summary
         total_time = time.time() - self.download_start_time
         
@@ -441,6 +609,19 @@ class YouTubeBulkDownloader:
         self.gui.log_message(f"   ✗ Failed: {len(failed_downloads)}")
         self.gui.log_message(f"   📦 Total size: {self.format_bytes(self.total_downloaded_bytes)}")
         self.gui.log_message(f"   ⏱ Total time: {self.format_time(total_time)}")
+        self.gui.log_message(f"   🔌 Sessions: {session_pool.created} created, {session_pool.reused} reused")
+        if verified_files:
+            self.gui.log_message(f"   🔍 Verified: {verified_files} file(s), {broken_files} broken, "
+                                 f"{repaired_files} repaired")
+        if content_store and content_store.reused:
+            self.gui.log_message(f"   ♻ Reused from store: {content_store.reused} "
+                                 f"(saved {self.format_bytes(content_store.bytes_saved)}, "
+                                 f"~{self.format_time(content_store.time_saved)})")
+        if self.audio_stats.get('copied') or self.audio_stats.get('encoded'):
+            self.gui.log_message(f"   🎵 Audio: {self.audio_stats['copied']} stream-copied, "
+                                 f"{self.audio_stats['encoded']} re-encoded "
+                                 f"({self.format_time(self.audio_stats['encode_time'])} encoding)")
+            self.gui.log_message(f"   ⚡ CPU time saved: ~{self.format_time(self.estimated_cpu_saved())}")
         
         if failed_downloads:
             self.gui.log_message(f"\n❌ Failed URLs:")
@@ -448,6 +629,191 @@ class YouTubeBulkDownloader:
                 self.gui.log_message(f"   • {url[:50]}...")
         
         self.gui.log_message(f"{'='*50}")
+        
+        if sync_mode and sync_interval and not self.cancel_event.is_set():
+            self.root.after(0, lambda: self.schedule_next_sync(sync_interval))
+    
+    def plan_entries(self, urls, session_pool, sync_state, download_path, playlist_limit):
+        """Resolve each URL to its videos, skipping those downloaded by earlier syncs"""
+        planned_urls, outtmpls, entries_out = [], [], []
+        
+        for url in urls:
+            if not self.is_downloading:
+                break
+            start = time.time()
+            try:
+                with session_pool.session() as session:
+                    known_ids = sync_state.known_ids(url) if sync_state else set()
+                    title, entries = fetch_new_entries(session.ydl, url, known_ids, playlist_limit)
+                if sync_state:
+                    entries = sync_state.queue(url, entries)
+            except Exception as e:
+                self.gui.log_message(f"   ✗ Listing failed for {url[:50]}: {str(e)[:100]}")
+                continue
+            
+            self.gui.log_message(f"   🔄 {title or url[:50]}: {len(entries)} {'new' if sync_state else 'videos'} "
+                                 f"(listed in {self.format_time(time.time() - start)})")
+            if sync_state:
+                sync_state.mark_synced(url, title)
+            
+            # Playlist entries go into a folder named after the playlist; single videos stay at the top level
+            if title:
+                outtmpl = os.path.join(download_path, sanitize_filename(title).replace('%', '%%'), '%(title)s.%(ext)s')
+            else:
+                outtmpl = os.path.join(download_path, '%(title)s.%(ext)s')
+            for entry in entries:
+                planned_urls.append(entry['url'])
+                outtmpls.append(outtmpl)
+                entries_out.append({'source': url, 'id': entry['id'], 'title': entry['title'], 'playlist': title})
+        
+        if sync_state:
+            sync_state.save()
+        return planned_urls, outtmpls, entries_out
+    
+    def link_from_store(self, content_store, session_pool, store_key, entry, outtmpl, reused):
+        """Place a stored video at its playlist destination"""
+        stored = content_store.lookup(store_key)
+        ext = os.path.splitext(stored['file'])[1].lstrip('.')
+        title = stored.get('title') or entry.get('title') or entry['id']
+        destination = session_pool.prepare_filename({'id': entry['id'], 'title': title, 'ext': ext}, outtmpl)
+        method = content_store.link(store_key, destination, reused=reused)
+        if method != "existing":
+            self.store_links.setdefault(os.path.join(content_store.root, stored['file']), []).append(
+                (destination, content_store.link_mode))
+        if reused:
+            self.gui.log_message(f"   ♻ Reused from store ({method}): {title}")
+    
+    def repair_files(self, broken, session_pool, ffprobe):
+        """Re-download only the files that failed verification, then check them again"""
+        self.gui.log_message(f"\n🔧 {len(broken)} file(s) failed verification")
+        still_broken = []
+        
+        for n, (job, problem) in enumerate(broken):
+            name = os.path.basename(job['path'])
+            self.gui.log_message(f"   ✗ {name}: {problem}")
+            if not self.is_downloading or not job.get('url'):
+                still_broken.append((job, problem))
+                continue
+            
+            # Set the broken file aside so yt-dlp does not skip it as already downloaded
+            backup = job['path'] + '.broken'
+            try:
+                os.replace(job['path'], backup)
+            except OSError:
+                backup = None
+            # Same folder and name as before; the extension follows the format actually produced
+            outtmpl = os.path.splitext(job['path'])[0].replace('%', '%%') + '.%(ext)s'
+            self.item_files = []
+            progress = self.begin_progress(n, len(broken), name)
+            try:
+                with session_pool.session(outtmpl=outtmpl, progress_hooks=[progress.hook]) as session:
+                    session.download([job['url']])
+            except Exception as e:
+                if not isinstance(e, DownloadCancelled):
+                    self.gui.log_message(f"   ✗ Repair failed: {str(e)[:100]}")
+                self.restore_backup(backup, job['path'])
+                still_broken.append((job, problem))
+                continue
+            
+            path = self.item_files[-1] if self.item_files else job['path']
+            problem = verify_file(ffprobe, path, job.get('duration'), job.get('streams', ()))
+            if problem:
+                self.gui.log_message(f"   ✗ Still broken after repair: {problem}")
+                self.restore_backup(backup, job['path'])
+                still_broken.append((job, problem))
+                continue
+            if backup:
+                os.remove(backup)
+            
+            # Links made from the broken store file still point at the old data
+            for destination, mode in self.store_links.get(job['path'], []):
+                try:
+                    os.remove(destination)
+                except OSError:
+                    pass
+                link_file(path, destination, mode)
+            self.gui.log_message(f"   ✓ Repaired: {os.path.basename(path)}")
+        
+        return still_broken
+    
+    def restore_backup(self, backup, path):
+        """Put a set-aside file back if the repair wrote nothing in its place, otherwise drop it"""
+        if not backup:
+            return
+        if os.path.exists(path):
+            os.remove(backup)
+        else:
+            os.replace(backup, path)
+    
+    def verify_folder(self, folder):
+        """Check every media file in an existing download folder with ffprobe"""
+        if self.is_downloading:
+            return
+        ffprobe = find_ffprobe(self.ffmpeg_path)
+        if not ffprobe:
+            messagebox.showwarning("ffprobe Required", "ffprobe was not found, so files cannot be verified.")
+            return
+        if not os.path.isdir(folder):
+            messagebox.showwarning("No Folder", f"Folder does not exist:\n{folder}")
+            return
+        
+        self.is_downloading = True
+        self.cancel_event.clear()
+        self.resume_event.set()
+        # Probes already queued keep running, so verification can be stopped but not paused
+        self.gui.set_downloading_state(True, can_pause=False)
+        threading.Thread(target=self._verify_folder_thread, args=(folder, ffprobe), daemon=True).start()
+    
+    def _verify_folder_thread(self, folder, ffprobe):
+        start = time.time()
+        files = find_media_files(folder)
+        self.gui.log_message(f"{'='*50}")
+        self.gui.log_message(f"🔍 Verifying {len(files)} file(s) in {folder}")
+        
+        def progress(done, total):
+            if self.cancel_event.is_set():
+                raise DownloadCancelled("Verification cancelled by user")
+            self.root.after(0, lambda: self.gui.set_progress((done / total) * 100))
+            self.root.after(0, lambda: self.gui.set_status(f"🔍 Verifying [{done}/{total}]"))
+        
+        pool = VerificationPool(ffprobe)
+        broken = []
+        try:
+            for path in files:
+                pool.submit({'path': path})
+            broken = pool.results(progress)
+        except DownloadCancelled:
+            self.gui.log_message("⏹ Verification cancelled by user")
+        finally:
+            pool.shutdown()
+        
+        for job, problem in broken:
+            self.gui.log_message(f"   ✗ {os.path.relpath(job['path'], folder)}: {problem}")
+        self.gui.log_message(f"   ✓ {len(files) - len(broken)} OK, ✗ {len(broken)} broken "
+                             f"({self.format_time(time.time() - start)})")
+        self.gui.log_message(f"{'='*50}")
+        
+        self.is_downloading = False
+        self.root.after(0, lambda: self.gui.set_downloading_state(False))
+        self.root.after(0, lambda: self.gui.set_status(f"🔍 Verification complete: {len(broken)} broken"))
+    
+    def schedule_next_sync(self, interval_minutes):
+        """Run the same subscriptions again after the interval"""
+        if self.sync_job:
+            self.root.after_cancel(self.sync_job)
+        self.gui.log_message(f"⏰ Next sync in {interval_minutes} min")
+        self.sync_job = self.root.after(int(interval_minutes * 60 * 1000), self.run_scheduled_sync)
+    
+    def run_scheduled_sync(self):
+        self.sync_job = None
+        # Unticking sync or clearing the interval in the meantime ends the schedule
+        if not self.gui.sync_schedule_enabled():
+            return
+        if self.is_downloading:
+            # Another run (or Verify Folder) is busy; try again shortly instead of dropping the schedule
+            self.sync_job = self.root.after(SYNC_RETRY_MS, self.run_scheduled_sync)
+            return
+        self.gui.on_start_download()
 
 
 def main():
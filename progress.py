@@ -0,0 +1,165 @@
+import functools
+
+
+# The GUI redraws download progress at most this often, however fast blocks arrive
+FRAME_INTERVAL_MS = 100
+TITLE_WIDTH = 40
+
+
+@functools.lru_cache(maxsize=4096)
+def format_bytes(bytes_value):
+    """Format bytes to human readable string"""
+    if bytes_value is None:
+        return "N/A"
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if bytes_value < 1024:
+            return f"{bytes_value:.2f} {unit}"
+        bytes_value /= 1024
+    return f"{bytes_value:.2f} TB"
+
+
+@functools.lru_cache(maxsize=4096)
+def format_time(seconds):
+    """Format seconds to human readable string"""
+    if seconds is None or seconds < 0:
+        return "N/A"
+    if seconds < 60:
+        return f"{int(seconds)}s"
+    elif seconds < 3600:
+        mins, secs = divmod(int(seconds), 60)
+        return f"{mins}m {secs}s"
+    else:
+        hours, remainder = divmod(int(seconds), 3600)
+        mins, secs = divmod(remainder, 60)
+        return f"{hours}h {mins}m {secs}s"
+
+
+def _no_checkpoint():
+    pass
+
+
+class ProgressContext:
+    """Progress of one queue item, written by yt-dlp's hook and drawn by the GUI once per frame
+
+    The hook runs for every received block, so it only stores numbers; text is
+    built in fields() when a frame is actually drawn.
+    """
+
+    __slots__ = ('index', 'total_files', 'title', 'phase', 'sample', 'version', 'finished_bytes',
+                 'tmpfilename', 'partial_files', 'finished_files', 'checkpoint', 'follow_playlist')
+
+    def __init__(self, index=0, total_files=0, title="", checkpoint=None, partial_files=None,
+                 follow_playlist=False):
+        self.index = index
+        self.total_files = total_files
+        self.title = ""
+        self.phase = "fetching"
+        # (downloaded, total, speed, eta) replaced as one tuple so a frame never sees a torn update
+        self.sample = (0, 0, None, None)
+        self.version = 0
+        self.finished_bytes = 0
+        self.tmpfilename = None
+        self.partial_files = partial_files if partial_files is not None else set()
+        # Streams finished but not yet merged or post-processed into the item's final file
+        self.finished_files = []
+        self.checkpoint = checkpoint or _no_checkpoint
+        self.follow_playlist = follow_playlist
+        self.set_title(title)
+
+    def set_title(self, title):
+        """Truncate the title once for display instead of on every block"""
+        self.title = title[:TITLE_WIDTH] + "..." if len(title) > TITLE_WIDTH else title
+        self.version += 1
+
+    def start_playlist(self, title, count):
+        self.index = 0
+        self.total_files = count
+        self.follow_playlist = True
+        self.set_title(f"Playlist: {title}")
+
+    def _new_file(self, d):
+        """Bookkeeping done once per file rather than once per block"""
+        self.tmpfilename = d.get('tmpfilename')
+        if self.tmpfilename:
+            self.partial_files.add((self.tmpfilename, d.get('filename', '')))
+        if self.follow_playlist:
+            number = (d.get('info_dict') or {}).get('playlist_autonumber')
+            if number:
+                self.index = number - 1
+
+    def item_done(self):
+        """The item's final file exists; its finished streams are no longer leftovers"""
+        self.partial_files.difference_update(self.finished_files)
+        self.finished_files = []
+
+    def hook(self, d):
+        """yt-dlp progress hook"""
+        status = d['status']
+        if status == 'downloading' and d.get('tmpfilename') != self.tmpfilename:
+            # Track the .part before a Stop landing on this first call can abort it
+            self._new_file(d)
+        self.checkpoint()
+
+        if status == 'downloading':
+            self.sample = (d.get('downloaded_bytes') or 0,
+                           d.get('total_bytes') or d.get('total_bytes_estimate') or 0,
+                           d.get('speed'), d.get('eta'))
+            self.phase = 'downloading'
+            self.version += 1
+
+        elif status == 'finished':
+            filename = d.get('filename', '')
+            self.partial_files.difference_update([p for p in self.partial_files if p[1] == filename])
+            # Until merging finishes, a Stop should clean up the finished stream (Title.fNNN.ext) too
+            self.partial_files.add((filename, filename))
+            self.finished_files.append((filename, filename))
+            self.tmpfilename = None
+            filesize = d.get('total_bytes') or d.get('downloaded_bytes') or 0
+            self.finished_bytes += filesize
+            self.sample = (filesize, filesize, None, None)
+            self.phase = 'processing'
+            self.version += 1
+
+        elif status == 'error':
+            self.phase = 'error'
+            self.version += 1
+
+    def fields(self):
+        """Keyword arguments for DownloaderGUI.update_progress describing the current state"""
+        downloaded, total, speed, eta = self.sample
+        phase = self.phase
+        if phase == 'fetching':
+            file_percent = 0
+        elif phase == 'processing':
+            file_percent = 100
+        else:
+            file_percent = (downloaded / total) * 100 if total > 0 else 0
+
+        if self.total_files > 0:
+            overall_percent = ((self.index + (file_percent / 100)) / self.total_files) * 100
+        else:
+            overall_percent = file_percent
+
+        if phase == 'fetching':
+            downloaded_str = total_str = speed_str = eta_str = "--"
+        elif phase == 'processing':
+            downloaded_str = total_str = format_bytes(total)
+            speed_str = eta_str = "--"
+        else:
+            downloaded_str = format_bytes(downloaded)
+            total_str = format_bytes(total) if total > 0 else "Unknown"
+            speed_str = f"{format_bytes(speed)}/s" if speed else "Calculating..."
+            eta_str = format_time(eta) if eta else "Calculating..."
+
+        return {
+            'overall_percent': overall_percent,
+            'file_percent': file_percent,
+            'file_num': self.index + 1,
+            'total_files': self.total_files,
+            'downloaded': downloaded_str,
+            'total_size': total_str,
+            'speed': speed_str,
+            'eta': eta_str,
+            'title': self.title,
+            'phase': phase,
+        }
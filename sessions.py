@@ -0,0 +1,124 @@
+import contextlib
+import threading
+
+import yt_dlp
+from yt_dlp.cookies import YoutubeDLCookieJar
+
+
+# Sessions are rebuilt after this many items to bound memory held by extractor caches
+SESSION_MAX_ITEMS = 50
+
+
+class Session:
+    """A long-lived YoutubeDL whose per-item hooks and output template change without rebuilding it"""
+
+    def __init__(self, ydl_opts, cookiejar):
+        self.progress_hooks = list(ydl_opts.get('progress_hooks', []))
+        self.postprocessor_hooks = list(ydl_opts.get('postprocessor_hooks', []))
+        self.post_hooks = list(ydl_opts.get('post_hooks', []))
+        self.ydl = yt_dlp.YoutubeDL({
+            **ydl_opts,
+            'progress_hooks': [self._dispatch_progress],
+            'postprocessor_hooks': [self._dispatch_postprocessor],
+            'post_hooks': [self._dispatch_post],
+        })
+        # Seed the lazily created jar so every session sends and updates the same cookies
+        self.ydl.__dict__['cookiejar'] = cookiejar
+        self.default_outtmpl = self.ydl.params['outtmpl']['default']
+        self.default_progress_hooks = self.progress_hooks
+        self.default_postprocessor_hooks = self.postprocessor_hooks
+        self.items = 0
+        self.failed = False
+
+    def _dispatch_progress(self, d):
+        for hook in self.progress_hooks:
+            hook(d)
+
+    def _dispatch_postprocessor(self, d):
+        for hook in self.postprocessor_hooks:
+            hook(d)
+
+    def _dispatch_post(self, filepath):
+        for hook in self.post_hooks:
+            hook(filepath)
+
+    def prepare(self, outtmpl=None, progress_hooks=None, postprocessor_hooks=None):
+        """Apply per-item settings, falling back to the batch defaults"""
+        self.failed = False
+        self.ydl.params['outtmpl']['default'] = outtmpl or self.default_outtmpl
+        self.progress_hooks = progress_hooks if progress_hooks is not None else self.default_progress_hooks
+        self.postprocessor_hooks = (postprocessor_hooks if postprocessor_hooks is not None
+                                    else self.default_postprocessor_hooks)
+
+    def download(self, urls):
+        """Download urls, remembering a failure that ignoreerrors kept from raising"""
+        retcode = self.ydl.download(urls)
+        if retcode:
+            self.failed = True
+        return retcode
+
+    def close(self):
+        self.ydl.close()
+
+
+class SessionPool:
+    """Per-worker YoutubeDL sessions reused across a batch, sharing one cookie jar"""
+
+    def __init__(self, ydl_opts, max_items=SESSION_MAX_ITEMS, cookiejar=None):
+        self.ydl_opts = ydl_opts
+        self.max_items = max_items
+        self.cookiejar = cookiejar if cookiejar is not None else YoutubeDLCookieJar()
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.sessions = []
+        self.created = 0
+        self.reused = 0
+
+    def _create(self):
+        session = Session(self.ydl_opts, self.cookiejar)
+        with self.lock:
+            self.sessions.append(session)
+            self.created += 1
+        return session
+
+    def _current(self):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self._create()
+        return session
+
+    def _recycle(self, session):
+        with self.lock:
+            if session in self.sessions:
+                self.sessions.remove(session)
+        self.local.session = None
+        session.close()
+
+    @contextlib.contextmanager
+    def session(self, outtmpl=None, progress_hooks=None, postprocessor_hooks=None):
+        """Borrow the calling thread's session for one item"""
+        if getattr(self.local, 'session', None) is not None:
+            self.reused += 1
+        session = self._current()
+        session.prepare(outtmpl, progress_hooks, postprocessor_hooks)
+        try:
+            yield session
+        except BaseException:
+            # A failed item can leave extractor or connection state behind; start fresh
+            self._recycle(session)
+            raise
+        session.items += 1
+        # With ignoreerrors yt-dlp reports failures through its return code instead of raising
+        if session.items >= self.max_items or session.failed:
+            self._recycle(session)
+
+    def prepare_filename(self, info, outtmpl):
+        """Render an output path with the calling thread's session without using up an item"""
+        return self._current().ydl.prepare_filename(info, outtmpl=outtmpl)
+
+    def close(self):
+        """Close every open session"""
+        with self.lock:
+            sessions, self.sessions = self.sessions, []
+        for session in sessions:
+            session.close()
@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import sys
+import threading
+
+
+STORE_DIR = ".store"
+LINK_MODES = ("hardlink", "reflink", "symlink", "copy")
+
+# Linux ioctl that shares extents between two files on btrfs/XFS
+FICLONE = 0x40049409
+
+
+def reflink(src, dst):
+    """Copy-on-write clone of src at dst; raises OSError where unsupported"""
+    if not sys.platform.startswith('linux'):
+        raise OSError("reflink is only supported on Linux")
+    import fcntl
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.remove(dst)
+            raise
+
+
+def link_file(src, dst, mode="hardlink"):
+    """Make src available at dst with the requested link type, falling back to a copy
+
+    Returns the method that was actually used.
+    """
+    os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+    methods = {
+        "hardlink": os.link,
+        "reflink": reflink,
+        "symlink": lambda s, d: os.symlink(os.path.abspath(s), d),
+    }
+    if mode in methods:
+        try:
+            methods[mode](src, dst)
+            return mode
+        except (OSError, NotImplementedError):
+            pass
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+class ContentStore:
+    """Downloads kept once per video ID, format and quality, linked into every folder that wants them"""
+
+    def __init__(self, download_path, link_mode="hardlink"):
+        self.root = os.path.join(download_path, STORE_DIR)
+        self.index_path = os.path.join(self.root, "index.json")
+        self.link_mode = link_mode
+        self.lock = threading.Lock()
+        self.index = {}
+        self.reused = 0
+        self.bytes_saved = 0
+        self.time_saved = 0
+        os.makedirs(self.root, exist_ok=True)
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+
+    @staticmethod
+    def make_key(video_id, variant):
+        return f"{video_id}-{variant}"
+
+    def outtmpl(self, key):
+        """Output template that downloads an item straight into the store"""
+        return os.path.join(self.root, key.replace('%', '%%') + '.%(ext)s')
+
+    def lookup(self, key):
+        """Return the stored entry for key if its file is still present"""
+        entry = self.index.get(key)
+        if entry and os.path.exists(os.path.join(self.root, entry['file'])):
+            return entry
+        return None
+
+    def add(self, key, path, seconds, title=None):
+        """Record a freshly downloaded file and how long it took to produce"""
+        with self.lock:
+            self.index[key] = {
+                'file': os.path.basename(path),
+                'title': title,
+                'size': os.path.getsize(path),
+                'seconds': round(seconds, 1),
+            }
+            self.save()
+
+    def link(self, key, dst, reused=True):
+        """Place the stored file for key at dst; returns the link method used"""
+        entry = self.index[key]
+        src = os.path.join(self.root, entry['file'])
+        if os.path.exists(dst):
+            method = "existing"
+        else:
+            method = link_file(src, dst, self.link_mode)
+        if reused:
+            self.reused += 1
+            self.bytes_saved += entry['size']
+            self.time_saved += entry['seconds']
+        return method
+
+    def save(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,134 @@
+import json
+import os
+import re
+import time
+
+
+SYNC_STATE_FILE = ".ytbd_sync.json"
+
+# A scheduled sync that finds another run busy tries again after this long
+SYNC_RETRY_MS = 60 * 1000
+
+# Channel pages: /@handle, /channel/UC..., /c/name or /user/name, optionally followed by a tab
+CHANNEL_PATTERN = re.compile(
+    r'(?:https?://)?(?:www\.|m\.)?youtube\.com/(@[\w.-]+|channel/UC[\w-]+|c/[\w.-]+|user/[\w.-]+)'
+    r'(/\w+)?/?(?:[?#]|$)')
+
+# Channel upload lists (UU...) and channel video tabs are ordered newest first;
+# regular playlists append at the end
+NEWEST_FIRST_PATTERN = re.compile(
+    r'[?&]list=UU|youtube\.com/(?:@[\w.-]+|channel/UC[\w-]+|c/[\w.-]+|user/[\w.-]+)'
+    r'/(?:videos|shorts|streams)/?(?:[?#]|$)')
+
+
+class SyncState:
+    """Entry IDs already downloaded for each synced URL, stored next to the downloads
+
+    Entries queued but not yet downloaded are kept as pending and queued again by
+    every later sync. Newest-first listings stop at the first known ID, so a video
+    that failed or was stopped would otherwise never be listed again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.playlists = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.playlists = json.load(f).get('playlists', {})
+            except (OSError, ValueError):
+                self.playlists = {}
+
+    def known_ids(self, url):
+        return set(self.playlists.get(url, {}).get('known_ids', []))
+
+    def queue(self, url, entries):
+        """Record newly listed entries as pending and return them after any left over from earlier runs"""
+        playlist = self.playlists.setdefault(url, {'known_ids': []})
+        known_ids = set(playlist['known_ids'])
+        listed = {entry['id'] for entry in entries}
+        leftover = [entry for entry in playlist.get('pending', [])
+                    if entry['id'] not in listed and entry['id'] not in known_ids]
+        queued = leftover + entries
+        playlist['pending'] = queued
+        return queued
+
+    def mark_known(self, url, entry_id, title=None):
+        playlist = self.playlists.setdefault(url, {'known_ids': []})
+        if entry_id not in playlist['known_ids']:
+            playlist['known_ids'].append(entry_id)
+        playlist['pending'] = [entry for entry in playlist.get('pending', []) if entry['id'] != entry_id]
+        if title:
+            playlist['title'] = title
+
+    def mark_synced(self, url, title=None):
+        playlist = self.playlists.setdefault(url, {'known_ids': []})
+        playlist['last_sync'] = int(time.time())
+        if title:
+            playlist['title'] = title
+
+    def save(self):
+        """Write the state atomically so an interrupted save never loses it"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'playlists': self.playlists}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+def channel_videos_url(url):
+    """Point a channel URL at its Videos tab; returns None if url is not a channel page"""
+    match = CHANNEL_PATTERN.match(url)
+    if not match:
+        return None
+    if match.group(2):
+        # Already a specific tab
+        return url
+    return f"https://www.youtube.com/{match.group(1)}/videos"
+
+
+def fetch_new_entries(ydl, url, known_ids, limit=0):
+    """List a playlist without resolving its videos and return (playlist title, unseen entries)
+
+    The title is None when url is a single video rather than a playlist.
+
+    Newest-first lists stop paging at the first known entry, so a sync with no
+    new uploads only fetches the first page.
+    """
+    info = ydl.extract_info(url, download=False, process=False)
+    # Playlist and watch?list= URLs hand off to the tab extractor
+    seen_urls = {url}
+    while info and info.get('_type') in ('url', 'url_transparent') and info.get('url') not in seen_urls:
+        seen_urls.add(info['url'])
+        info = ydl.extract_info(info['url'], download=False, process=False, ie_key=info.get('ie_key'))
+    if not info:
+        return None, []
+
+    if 'entries' not in info:
+        # A single video: new unless it was downloaded by an earlier sync
+        entry = {'id': info.get('id'), 'url': info.get('webpage_url') or url, 'title': info.get('title')}
+        return None, [] if entry['id'] in known_ids else [entry]
+
+    newest_first = bool(NEWEST_FIRST_PATTERN.search(url))
+    new_entries = []
+    for entry in info['entries']:
+        if not entry:
+            continue
+        if entry.get('id') in known_ids:
+            if newest_first:
+                break
+            continue
+        new_entries.append({
+            'id': entry.get('id'),
+            'url': entry.get('url') or entry.get('webpage_url'),
+            'title': entry.get('title'),
+        })
+        # Without known IDs to skip, the first entries are the ones kept, so stop paging there
+        if limit and (newest_first or not known_ids) and len(new_entries) >= limit:
+            break
+
+    if limit:
+        new_entries = new_entries[:limit]
+    if newest_first:
+        # Download in upload order, oldest first
+        new_entries.reverse()
+    return info.get('title'), new_entries
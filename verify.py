@@ -0,0 +1,137 @@
+import concurrent.futures
+import json
+import os
+import shutil
+import subprocess
+
+
+MEDIA_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.m4a', '.mp3', '.opus', '.ogg', '.flac', '.wav')
+VERIFY_WORKERS = min(4, os.cpu_count() or 1)
+
+# Allowed gap between expected and actual duration: 2 seconds or 1%, whichever is larger
+DURATION_TOLERANCE = 2.0
+DURATION_TOLERANCE_RATIO = 0.01
+
+
+def find_ffprobe(ffmpeg_path):
+    """Locate ffprobe next to the bundled FFmpeg, falling back to PATH"""
+    for name in ("ffprobe.exe", "ffprobe"):
+        candidate = os.path.join(ffmpeg_path, name)
+        if os.path.exists(candidate):
+            return candidate
+    return shutil.which("ffprobe")
+
+
+def probe(ffprobe, path):
+    """Read container duration and per-stream types/durations from the file headers"""
+    result = subprocess.run(
+        [ffprobe, '-v', 'error', '-show_entries', 'format=duration:stream=codec_type,duration',
+         '-of', 'json', path],
+        capture_output=True, text=True, timeout=60,
+        creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "ffprobe failed")
+    data = json.loads(result.stdout or '{}')
+    duration = float(data.get('format', {}).get('duration') or 0)
+    streams = {}
+    for stream in data.get('streams', []):
+        kind = stream.get('codec_type')
+        if kind in ('video', 'audio'):
+            streams[kind] = max(streams.get(kind, 0), float(stream.get('duration') or 0))
+    return duration, streams
+
+
+def _tolerance(duration):
+    return max(DURATION_TOLERANCE, duration * DURATION_TOLERANCE_RATIO)
+
+
+def expected_streams(info, audio_only=False):
+    """Streams the downloaded format actually carries, per its vcodec/acodec metadata
+
+    Unknown codecs are not expected, so a source without metadata is only checked for
+    having some stream. Audio extraction drops video even when the source had it.
+    """
+    streams = []
+    if not audio_only and info.get('vcodec') not in (None, 'none'):
+        streams.append('video')
+    if info.get('acodec') not in (None, 'none'):
+        streams.append('audio')
+    return tuple(streams)
+
+
+def verify_file(ffprobe, path, expected_duration=None, expected_streams=()):
+    """Return a description of what is wrong with a file, or None if it looks complete"""
+    if not os.path.exists(path):
+        return "missing"
+    if os.path.getsize(path) == 0:
+        return "empty file"
+    try:
+        duration, streams = probe(ffprobe, path)
+    except (RuntimeError, ValueError, OSError, subprocess.TimeoutExpired) as e:
+        return f"unreadable ({str(e)[:60]})"
+
+    missing = [kind for kind in expected_streams if kind not in streams]
+    if missing:
+        return f"missing {', '.join(missing)} stream"
+    if not streams:
+        return "no audio or video streams"
+    if duration <= 0:
+        return "zero duration"
+    if expected_duration and abs(duration - expected_duration) > _tolerance(expected_duration):
+        return f"duration {duration:.0f}s, expected {expected_duration:.0f}s"
+    # A killed merge leaves one stream much shorter than the container
+    for kind, stream_duration in streams.items():
+        if stream_duration and duration - stream_duration > _tolerance(duration):
+            return f"{kind} stream ends at {stream_duration:.0f}s of {duration:.0f}s"
+    return None
+
+
+def find_media_files(folder):
+    """All finished media files under folder, each linked file counted once"""
+    found = []
+    seen = set()
+    for root_dir, dirs, files in os.walk(folder):
+        for name in files:
+            path = os.path.join(root_dir, name)
+            if not name.lower().endswith(MEDIA_EXTENSIONS) or os.path.islink(path):
+                continue
+            stat = os.stat(path)
+            if (stat.st_dev, stat.st_ino) in seen:
+                continue
+            seen.add((stat.st_dev, stat.st_ino))
+            found.append(path)
+    return found
+
+
+class VerificationPool:
+    """Checks finished files with ffprobe in the background while downloads continue"""
+
+    def __init__(self, ffprobe, max_workers=VERIFY_WORKERS):
+        self.ffprobe = ffprobe
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self.futures = []
+
+    def submit(self, job):
+        """Queue a job dict with 'path' and optional 'duration' and 'streams'"""
+        future = self.executor.submit(
+            verify_file, self.ffprobe, job['path'], job.get('duration'), job.get('streams', ()))
+        self.futures.append((job, future))
+
+    def results(self, progress=None):
+        """Wait for every queued check and return (job, problem) pairs for broken files"""
+        broken = []
+        total = len(self.futures)
+        for done, (job, future) in enumerate(self.futures, 1):
+            problem = future.result()
+            if problem:
+                broken.append((job, problem))
+            if progress:
+                progress(done, total)
+        self.futures = []
+        return broken
+
+    def shutdown(self):
+        for _, future in self.futures:
+            future.cancel()
+        self.executor.shutdown(wait=False)
+        self.futures = []